@@ -2,17 +2,11 @@
 from typing import Optional, List
 
 from src.backend.PluginManager.ActionBase import ActionBase
-from src.backend.DeckManagement.DeckController import DeckController
-from src.backend.PageManagement.Page import Page
-from src.backend.PluginManager.PluginBase import PluginBase
 
 # Import python modules
-import os
 from loguru import logger as log
-from GtkHelper.GenerativeUI.EntryRow import EntryRow # For regular text input
-from GtkHelper.GenerativeUI.PasswordEntryRow import PasswordEntryRow # For secrets
 
-# Import gtk modules - used for the config rows
+# Import gtk modules - used for the device dialog
 import gi
 
 from ...utils.SpotifyController import SpotifyController, Device
@@ -25,17 +19,18 @@ class SelectDevice(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._active_dialog = None  # To keep track of the currently open dialog
+        self._loading_devices = False  # Device list is being fetched in the background
 
     @property
     def get_controller(self) -> SpotifyController:
         return self.plugin_base.get_controller
 
     def on_ready(self) -> None:
-        icon_path = os.path.join(self.plugin_base.PATH, "assets", "media_output.png")
+        icon_path = self.plugin_base.ASSETS["media_output"]
         self.set_media(media_path=icon_path, size=0.75)
 
     def on_key_down(self) -> None:
-        print("Key down")
+        pass
 
     def on_key_up(self) -> None:
         log.info(f"'{getattr(self, 'uuid', 'N/A')}' Key up - attempting to show device selection dialog.")
@@ -43,7 +38,16 @@ class SelectDevice(ActionBase):
             log.warning("Device selection dialog is already open. Focusing it.")
             self._active_dialog.present()  # Bring to front if already exists
             return
-        self._show_device_selection_dialog()
+        if self._loading_devices:
+            log.debug("Device list is still loading.")
+            return
+        self._loading_devices = True
+        # Fetch the device list off the GTK main thread, then build the dialog with the result
+        self.get_controller.run_in_background(self._get_devices, on_done=self._show_device_selection_dialog,
+                                              on_error=self._on_devices_failed)
+
+    def _on_devices_failed(self, _error: Exception) -> None:
+        self._loading_devices = False  # Let the next key press try again
 
     def _get_devices(self) -> Optional[List[Device]]:
         return self.get_controller.get_playback_devices()
@@ -53,8 +57,9 @@ class SelectDevice(ActionBase):
 
     def _get_parent_window(self) -> Gtk.Window | None:
         pass
-    def _show_device_selection_dialog(self):
+    def _show_device_selection_dialog(self, devices: Optional[List[Device]]):
         """Creates and shows the Adwaita dialog for device selection."""
+        self._loading_devices = False
         #parent_window = self._get_parent_window()
 
         # Create the Adw.Dialog
@@ -91,8 +96,6 @@ class SelectDevice(ActionBase):
         # In a real scenario, these would come from:
         # spotify_controller = self.get_controller
         # if spotify_controller: device_names = spotify_controller.get_available_devices()
-        devices = self._get_devices()
-
         if not devices:
             # Handle case where no devices are found
             empty_label = Gtk.Label(label="No devices found.")
@@ -142,7 +145,7 @@ class SelectDevice(ActionBase):
         self._active_dialog = None  # Clear the reference
 
     def _on_select_device(self, dialog, device : Device):
-        self.get_controller.set_playback_device(device)
+        self.get_controller.run_in_background(self.get_controller.set_playback_device, device)
 
 
     def on_destroy(self):  # Example lifecycle method, adapt if ActionBase has a different one
@@ -1,33 +1,35 @@
 # Import StreamController modules
-from PIL.ImageFile import ImageFile
 from src.backend.PluginManager.ActionBase import ActionBase
-from src.backend.DeckManagement.DeckController import DeckController
-from src.backend.PageManagement.Page import Page
-from src.backend.PluginManager.PluginBase import PluginBase
 
 # Import python modules
-import io
-import os
+import threading
+from collections import OrderedDict
 import requests
+import numpy as np
 from PIL import Image
 from loguru import logger as log
-from GtkHelper.GenerativeUI.EntryRow import EntryRow # For regular text input
-from GtkHelper.GenerativeUI.PasswordEntryRow import PasswordEntryRow # For secrets
-
-# Import gtk modules - used for the config rows
-import gi
 
 from ...utils.SpotifyController import SpotifyController
 
-gi.require_version("Gtk", "4.0")
-gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw
+ART_CACHE_SIZE = 8  # Album covers (and composited key images) kept in memory
 
 class PlayResume(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.play_icon = os.path.join(self.plugin_base.PATH, "assets", "play.png")
-        self.pause_icon = os.path.join(self.plugin_base.PATH, "assets", "pause.png")
+        self.play_icon = self.plugin_base.ASSETS["play"]
+        self.pause_icon = self.plugin_base.ASSETS["pause"]
+        self._playback_icons = (self.play_icon, self.pause_icon)  # Indexed by is_playing
+        # LRU caches, rendering runs on worker threads so access is guarded by a lock
+        self._cache_lock = threading.Lock()
+        self._art_cache: OrderedDict[str, Image.Image] = OrderedDict()
+        self._composite_cache: OrderedDict[tuple[str, str], Image.Image] = OrderedDict()
+        # Icons are decoded once; scaled variants are cached per (icon_path, background size)
+        self._icons: dict[str, Image.Image] = {}
+        for icon_path in (self.play_icon, self.pause_icon):
+            icon = self.load_overlay(icon_path)
+            if icon is not None:
+                self._icons[icon_path] = icon
+        self._scaled_icons: dict[tuple[str, tuple[int, int]], Image.Image] = {}
 
     @property
     def get_controller(self) -> SpotifyController:
@@ -35,14 +37,22 @@ class PlayResume(ActionBase):
 
     def on_ready(self) -> None:
         self.update_state()
-        self.get_controller.register_update_callback(self.update_state)
+        self.get_controller.register_update_callback(self._on_state_changed)
 
     def on_key_down(self) -> None:
-        print("Key down")
-        playing = self.get_controller.is_playing()
-        log.info(f"Playback state = {playing}")
-        new_state = self.get_controller.pause() if playing else self.get_controller.play()
-        self.update_state()
+        self.get_controller.run_in_background(self._toggle_playback, on_done=self._apply_media)
+
+    def _toggle_playback(self) -> Image.Image | None:
+        # Runs on a worker thread, see SpotifyController.run_in_background
+        controller = self.get_controller
+        state = controller.latest_playback_state or controller.get_playback_state()
+        playing = bool(state and state.get("is_playing"))
+        log.debug("Playback state = {}", playing)
+        if not (controller.pause() if playing else controller.play()):
+            return None
+        # The command succeeded, render the requested state instead of fetching it again;
+        # the next poll reconciles should Spotify disagree
+        return self._render_state(dict(state or {}, is_playing=not playing))
 
     def load_overlay(self, icon_path):
         try:
@@ -51,7 +61,7 @@ class PlayResume(ActionBase):
                 icon_pil_image = icon_img.convert("RGBA")
                 #self.show_overlay(image=icon_pil_image)
                 log.info(f"Successfully showed overlay icon from {icon_path}.")
-                return icon_pil_image.copy()
+                return icon_pil_image  # convert() already returned a new image
 
                 # If you want the overlay to disappear after some time, specify 'duration' in seconds
                 # self.show_overlay(image=icon_pil_image, duration=5)
@@ -62,34 +72,30 @@ class PlayResume(ActionBase):
         except Exception as e:
             log.error(f"An unexpected error occurred while setting overlay: {e}")
 
-    def merge_icon_on_background_centered(
+    def scale_icon_to_background(
             self,
-            background_img: Image.Image,
-            icon_img: Image.Image
+            icon_img: Image.Image,
+            background_size: tuple[int, int]
     ) -> Image.Image:
         """
-        Scales an icon to fit within 90% of the background's dimensions,
-        maintaining aspect ratio, and merges it onto the center of the background.
+        Scales an icon to fit within 70% of the background's dimensions,
+        maintaining aspect ratio.
 
         Args:
-            background_img: A PIL Image object for the background.
             icon_img: A PIL Image object for the icon.
+            background_size: The (width, height) of the background the icon will be merged onto.
 
         Returns:
-            A new PIL Image object with the icon composited onto the background.
+            A new RGBA PIL Image object with the scaled icon.
         """
-        if background_img is None or icon_img is None:
-            raise ValueError("Both background and icon images must be provided.")
-
-        # Ensure images are in RGBA format to handle transparency properly
-        bg_img = background_img.convert("RGBA")
-        ic_img = icon_img.convert("RGBA")
+        # Ensure the icon is in RGBA format to handle transparency properly
+        ic_img = icon_img if icon_img.mode == "RGBA" else icon_img.convert("RGBA")
 
-        bg_width, bg_height = bg_img.size
+        bg_width, bg_height = background_size
         icon_width, icon_height = ic_img.size
 
-        # 1. Calculate target dimensions for the icon (to fit within 90% of background)
-        # The icon should fit within a container that is 90% of the background size.
+        # 1. Calculate target dimensions for the icon (to fit within 70% of background)
+        # The icon should fit within a container that is 70% of the background size.
         target_container_width = bg_width * 0.70
         target_container_height = bg_height * 0.70
 
@@ -109,43 +115,100 @@ class PlayResume(ActionBase):
         if new_icon_width < 1: new_icon_width = 1
         if new_icon_height < 1: new_icon_height = 1
 
-        scaled_icon_img = ic_img.resize((new_icon_width, new_icon_height), Image.Resampling.LANCZOS)
+        return ic_img.resize((new_icon_width, new_icon_height), Image.Resampling.LANCZOS)
 
-        # 3. Calculate position for centering the scaled icon
-        # Use the actual dimensions of the scaled icon
-        scaled_icon_actual_width, scaled_icon_actual_height = scaled_icon_img.size
-        pos_x = (bg_width - scaled_icon_actual_width) // 2
-        pos_y = (bg_height - scaled_icon_actual_height) // 2
-        position = (pos_x, pos_y)
+    def _get_scaled_icon(self, icon_path: str, background_size: tuple[int, int]) -> Image.Image | None:
+        """Returns the icon scaled for the given background size, resizing only on the first request."""
+        key = (icon_path, background_size)
+        scaled_icon = self._scaled_icons.get(key)
+        if scaled_icon is None:
+            icon = self._icons.get(icon_path)
+            if icon is None:
+                return None
+            scaled_icon = self.scale_icon_to_background(icon, background_size)
+            self._scaled_icons[key] = scaled_icon
+        return scaled_icon
 
-        # 4. Composite the images
-        # Create a copy of the background to paste onto
-        output_img = bg_img.copy()
-        # Paste the scaled icon using its alpha channel as a mask
-        output_img.paste(scaled_icon_img, position, mask=scaled_icon_img)
+    def merge_icon_on_background_centered(
+            self,
+            background_img: Image.Image,
+            scaled_icon_img: Image.Image
+    ) -> Image.Image:
+        """
+        Merges an already scaled icon (see scale_icon_to_background) onto the center of the background.
 
-        return output_img
+        Args:
+            background_img: A PIL Image object for the background.
+            scaled_icon_img: An RGBA PIL Image object for the scaled icon.
 
+        Returns:
+            A new PIL Image object with the icon composited onto the background.
+        """
+        if background_img is None or scaled_icon_img is None:
+            raise ValueError("Both background and icon images must be provided.")
 
-    def load_background_media(self) -> Image.Image | None:
+        # Ensure the background is in RGBA format to handle transparency properly
+        bg_img = background_img if background_img.mode == "RGBA" else background_img.convert("RGBA")
+        bg_width, bg_height = bg_img.size
+
+        # 3. Calculate position for centering the scaled icon
+        scaled_icon_width, scaled_icon_height = scaled_icon_img.size
+        pos_x = (bg_width - scaled_icon_width) // 2
+        pos_y = (bg_height - scaled_icon_height) // 2
+
+        # 4. Composite the images
+        # Alpha-blend only the icon's bounding box, same result as paste(icon, pos, mask=icon):
+        # out = (icon * a + bg * (255 - a)) / 255 for every band, in uint16 to avoid overflow
+        output = np.array(bg_img, dtype=np.uint8)  # Writable copy of the background
+        region = output[pos_y:pos_y + scaled_icon_height, pos_x:pos_x + scaled_icon_width]
+        icon = np.asarray(scaled_icon_img, dtype=np.uint16)
+        alpha = icon[..., 3:4]
+        region[...] = (icon * alpha + region.astype(np.uint16) * (255 - alpha) + 127) // 255
+
+        return Image.fromarray(output)  # (h, w, 4) uint8 is read back as RGBA
+
+    def _cache_get(self, cache: OrderedDict, key):
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key, value) -> None:
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > ART_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def load_background_media(self, album_image_url: str | None = None) -> Image.Image | None:
         # try to get album art
         try:
-            album_image_url = self.get_controller.get_playback_art_url()
+            if album_image_url is None:
+                album_image_url = self.get_controller.get_playback_art_url()
             if album_image_url:
-                # Fetch the image from the URL
-                response = requests.get(album_image_url, stream=True)
-                response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
-                log.info(f"got image from {album_image_url}")
-
-                # Open the image from the response content
-                # Using io.BytesIO to treat the byte stream like a file
-                background_pil_image = Image.open(io.BytesIO(response.content))
+                cached = self._cache_get(self._art_cache, album_image_url)
+                if cached is not None:
+                    return cached
+                # Fetch the image from the URL over the controller's pooled session
+                # The context manager returns the connection to the pool once the body is consumed
+                with self.get_controller.fetch_resource(album_image_url, stream=True) as response:
+                    response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
+                    log.debug("got image from {}", album_image_url)
+
+                    # Decode straight from the raw response stream instead of buffering response.content
+                    response.raw.decode_content = True  # Let urllib3 undo any gzip/deflate transfer encoding
+                    background_pil_image = Image.open(response.raw)
+                    background_pil_image.load()  # Read all pixel data before the stream is closed
 
                 # Set the media using the PIL Image object
                 # .copy() is good practice if you intend to reuse the PIL image object elsewhere
                 #self.set_media(image=background_pil_image.copy(), media_path=icon_path)
-                log.info("Successfully retrieved background image from URL.")
-                return background_pil_image.copy()
+                log.debug("Successfully retrieved background image from URL.")
+                # Convert once here so merging never has to convert the cached background again
+                background_pil_image = background_pil_image.convert("RGBA")
+                self._cache_put(self._art_cache, album_image_url, background_pil_image)
+                return background_pil_image
             else:
                 return None
         except requests.exceptions.RequestException as e:
@@ -158,15 +221,38 @@ class PlayResume(ActionBase):
             log.error(f"An unexpected error occurred while setting background: {e}")
 
     def update_state(self, state=None):
-        playing = self.get_controller.is_playing(state)
-        icon_path = self.play_icon if not playing else self.pause_icon
-        background = self.load_background_media()
-        icon = self.load_overlay(icon_path)
+        # Album art download and image composition happen off the GTK main thread
+        self.get_controller.run_in_background(self._render_state, state, on_done=self._apply_media)
+
+    def _on_state_changed(self, state=None):
+        # The poller passes None when playback became inactive, render that instead of fetching again
+        self.get_controller.run_in_background(self._render_state, state, False, on_done=self._apply_media)
+
+    def _render_state(self, state=None, fetch_missing: bool = True) -> Image.Image | None:
+        # One /me/player lookup provides both the play state and the album art URL
+        player_state = self.get_controller.get_player_state(state) if state or fetch_missing else None
+        playing = player_state.is_playing if player_state else False
+        icon_path = self._playback_icons[playing]
+        album_image_url = player_state.album_art_url if player_state else None
+        if album_image_url:
+            cached = self._cache_get(self._composite_cache, (album_image_url, icon_path))
+            if cached is not None:
+                return cached
+        background = self.load_background_media(album_image_url) if album_image_url else None
+        icon = self._icons.get(icon_path)
         if background and icon:
-            combined = self.merge_icon_on_background_centered(background, icon)
-            self.set_media(image=combined.copy())
+            scaled_icon = self._get_scaled_icon(icon_path, background.size)
+            combined = self.merge_icon_on_background_centered(background, scaled_icon)
+            self._cache_put(self._composite_cache, (album_image_url, icon_path), combined)
+            return combined
         elif background is None and icon:
-            self.set_media(image=icon)
+            return icon
+        return None
+
+    def _apply_media(self, image: Image.Image | None) -> None:
+        if image is not None:
+            # Rendered images are shared with the caches, hand set_media its own copy
+            self.set_media(image=image.copy())
 
 
 
@@ -1,30 +1,14 @@
 # Import StreamController modules
 from src.backend.PluginManager.ActionBase import ActionBase
-from src.backend.DeckManagement.DeckController import DeckController
-from src.backend.PageManagement.Page import Page
-from src.backend.PluginManager.PluginBase import PluginBase
-
-# Import python modules
-import os
-from loguru import logger as log
-from GtkHelper.GenerativeUI.EntryRow import EntryRow # For regular text input
-from GtkHelper.GenerativeUI.PasswordEntryRow import PasswordEntryRow # For secrets
-
-# Import gtk modules - used for the config rows
-import gi
 
 from ...utils.SpotifyController import SpotifyController
 
-gi.require_version("Gtk", "4.0")
-gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw
-
 class Repeat(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.repeat_context_icon = os.path.join(self.plugin_base.PATH, "assets", "repeat.png")
-        self.repeat_one_icon = os.path.join(self.plugin_base.PATH, "assets", "repeat_one.png")
-        self.no_repeat_icon = os.path.join(self.plugin_base.PATH, "assets", "no_repeat.png")
+        self.repeat_context_icon = self.plugin_base.ASSETS["repeat"]
+        self.repeat_one_icon = self.plugin_base.ASSETS["repeat_one"]
+        self.no_repeat_icon = self.plugin_base.ASSETS["no_repeat"]
         self.repeat_states = ["off", "track", "context"]
         self.icon_paths = [self.no_repeat_icon, self.repeat_one_icon, self.repeat_context_icon]
 
@@ -33,26 +17,34 @@ class Repeat(ActionBase):
         return self.plugin_base.get_controller
 
     def on_ready(self) -> None:
-        self.on_update()
-        self.get_controller.register_update_callback(self.on_update)
+        state = self.get_controller.latest_playback_state
+        self.on_update(state.get("repeat_state") if state else None)  # Last known value until the next publish
+        self.get_controller.subscribe("repeat_state", self.on_update)
 
     def on_key_down(self) -> None:
-        repeat = self.get_controller.get_repeat_state()
-        idx = max((self.repeat_states.index(repeat)+1)%3,0)
-        next_state = self.repeat_states[idx]
-        next_state_icon = self.repeat_context_icon[idx]
-        self.get_controller.set_repeat_state(next_state)
-        self.set_media(media_path=next_state_icon, size=0.75)
-
-    def on_update(self, state=None):
-        repeat_state = self.get_controller.get_repeat_state(state)
-        if repeat_state is None:
+        self.get_controller.run_in_background(self._cycle_repeat_state, on_done=self._show_icon)
+
+    def _cycle_repeat_state(self) -> str | None:
+        # Runs on a worker thread, see SpotifyController.run_in_background
+        repeat = self.get_controller.get_repeat_state() or "off"  # Unknown state cycles from "off"
+        idx = (self.repeat_states.index(repeat) + 1) % 3
+        if not self.get_controller.set_repeat_state(self.repeat_states[idx]):
+            return None
+        # We already know the new state, render it without fetching it again;
+        # the update callback reconciles should Spotify disagree
+        return self.icon_paths[idx]
+
+    def _show_icon(self, icon_path: str | None) -> None:
+        if icon_path is not None:
+            self.set_media(media_path=icon_path, size=0.75)
+
+    def on_update(self, repeat_state: str | None) -> None:
+        # Receives the polled value directly, no state lookup (or fetch) of its own
+        if repeat_state not in self.repeat_states:
             # default to no repeat
-            icon = self.icon_paths[0]
-            self.set_media(media_path=icon, size=0.75)
-        else:
-            icon = self.icon_paths[self.repeat_states.index(repeat_state)]
-            self.set_media(media_path=icon, size=0.75)
+            repeat_state = "off"
+        icon = self.icon_paths[self.repeat_states.index(repeat_state)]
+        self.set_media(media_path=icon, size=0.75)
 
     def on_key_up(self) -> None:
         pass
\ No newline at end of file
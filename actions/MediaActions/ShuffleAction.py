@@ -1,29 +1,20 @@
 # Import StreamController modules
 from src.backend.PluginManager.ActionBase import ActionBase
-from src.backend.DeckManagement.DeckController import DeckController
-from src.backend.PageManagement.Page import Page
-from src.backend.PluginManager.PluginBase import PluginBase
 
-# Import python modules
-import os
-from loguru import logger as log
-from GtkHelper.GenerativeUI.EntryRow import EntryRow # For regular text input
-from GtkHelper.GenerativeUI.PasswordEntryRow import PasswordEntryRow # For secrets
-
-# Import gtk modules - used for the config rows
-import gi
+from gi.repository import GLib
 
 from ...utils.SpotifyController import SpotifyController
 
-gi.require_version("Gtk", "4.0")
-gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw
-
 class Shuffle(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.shuffle_icon = os.path.join(self.plugin_base.PATH, "assets", "shuffle.png")
-        self.no_shuffle_icon = os.path.join(self.plugin_base.PATH, "assets", "no_shuffle.png")
+        self.shuffle_icon = self.plugin_base.ASSETS["shuffle"]
+        self.no_shuffle_icon = self.plugin_base.ASSETS["no_shuffle"]
+        self._shuffle_icons = (self.no_shuffle_icon, self.shuffle_icon)  # Indexed by bool(shuffle)
+        # Redraw coalescing: at most one set_media per idle cycle, and none if the icon is unchanged
+        self._current_icon = None
+        self._queued_icon = None
+        self._redraw_pending = False
 
 
     @property
@@ -31,18 +22,32 @@ class Shuffle(ActionBase):
         return self.plugin_base.get_controller
 
     def on_ready(self) -> None:
-        self.on_update()
-        self.get_controller.register_update_callback(self.on_update)
+        self._current_icon = None  # The key was (re)shown, always draw once
+        state = self.get_controller.latest_playback_state
+        self._show_shuffle(state.get("shuffle_state") if state else False)  # Last known value until the next publish
+        self.get_controller.subscribe("shuffle_state", self._show_shuffle)
 
     def on_key_down(self) -> None:
-        shuffle = self.get_controller.toggle_shuffle()
-        icon_path = self.shuffle_icon if shuffle else self.no_shuffle_icon
-        self.set_media(media_path=icon_path, size=0.75)
-
-    def on_update(self, state=None):
-        shuffle = self.get_controller.get_shuffle_state(state)
-        icon_path = self.shuffle_icon if shuffle else self.no_shuffle_icon
-        self.set_media(media_path=icon_path, size=0.75)
+        self.get_controller.run_in_background(self.get_controller.toggle_shuffle, on_done=self._show_toggled)
+
+    def _show_toggled(self, shuffle: bool | None) -> None:
+        # None: the state was unknown or the command failed, nothing changed on Spotify
+        if shuffle is not None:
+            self._show_shuffle(shuffle)
+
+    def _show_shuffle(self, shuffle) -> None:
+        self._queued_icon = self._shuffle_icons[bool(shuffle)]
+        if self._redraw_pending:
+            return  # The scheduled redraw picks up the latest queued icon
+        self._redraw_pending = True
+        GLib.idle_add(self._apply_icon)
+
+    def _apply_icon(self) -> bool:
+        self._redraw_pending = False
+        if self._queued_icon != self._current_icon:
+            self._current_icon = self._queued_icon
+            self.set_media(media_path=self._current_icon, size=0.75)
+        return GLib.SOURCE_REMOVE
 
     def on_key_up(self) -> None:
-        pass
\ No newline at end of file
+        pass
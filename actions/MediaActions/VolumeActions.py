@@ -1,28 +1,12 @@
 # Import StreamController modules
 from src.backend.PluginManager.ActionBase import ActionBase
-from src.backend.DeckManagement.DeckController import DeckController
-from src.backend.PageManagement.Page import Page
-from src.backend.PluginManager.PluginBase import PluginBase
-
-# Import python modules
-import os
-from loguru import logger as log
-from GtkHelper.GenerativeUI.EntryRow import EntryRow # For regular text input
-from GtkHelper.GenerativeUI.PasswordEntryRow import PasswordEntryRow # For secrets
-
-# Import gtk modules - used for the config rows
-import gi
 
 from ...utils.SpotifyController import SpotifyController
 
-gi.require_version("Gtk", "4.0")
-gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw
-
 class VolumeUp(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.icon = os.path.join(self.plugin_base.PATH, "assets", "volume_up.png")
+        self.icon = self.plugin_base.ASSETS["volume_up"]
 
 
     @property
@@ -34,8 +18,13 @@ class VolumeUp(ActionBase):
         self.set_media(media_path=icon_path, size=0.75)
 
     def on_key_down(self) -> None:
+        self.get_controller.run_in_background(self._change_volume)
+
+    def _change_volume(self) -> bool:
         current_volume = self.get_controller.get_volume()
-        self.get_controller.set_volume(min(current_volume + 10, 100))
+        if current_volume is None:  # No active device or state unavailable, nothing to adjust
+            return False
+        return self.get_controller.set_volume(min(current_volume + 10, 100))
 
 
     def on_key_up(self) -> None:
@@ -44,7 +33,7 @@ class VolumeUp(ActionBase):
 class VolumeDown(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.icon = os.path.join(self.plugin_base.PATH, "assets", "volume_down.png")
+        self.icon = self.plugin_base.ASSETS["volume_down"]
 
 
     @property
@@ -56,8 +45,13 @@ class VolumeDown(ActionBase):
         self.set_media(media_path=icon_path, size=0.75)
 
     def on_key_down(self) -> None:
+        self.get_controller.run_in_background(self._change_volume)
+
+    def _change_volume(self) -> bool:
         current_volume = self.get_controller.get_volume()
-        self.get_controller.set_volume(max(current_volume - 10, 0))
+        if current_volume is None:  # No active device or state unavailable, nothing to adjust
+            return False
+        return self.get_controller.set_volume(max(current_volume - 10, 0))
 
 
     def on_key_up(self) -> None:
@@ -66,7 +60,7 @@ class VolumeDown(ActionBase):
 class VolumeMute(ActionBase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.icon = os.path.join(self.plugin_base.PATH, "assets", "volume_down.png")
+        self.icon = self.plugin_base.ASSETS["volume_down"]
 
 
     @property
@@ -78,8 +72,13 @@ class VolumeMute(ActionBase):
         self.set_media(media_path=icon_path, size=0.75)
 
     def on_key_down(self) -> None:
+        self.get_controller.run_in_background(self._change_volume)
+
+    def _change_volume(self) -> bool:
         current_volume = self.get_controller.get_volume()
-        self.get_controller.set_volume(max(current_volume - 10, 0))
+        if current_volume is None:  # No active device or state unavailable, nothing to adjust
+            return False
+        return self.get_controller.set_volume(max(current_volume - 10, 0))
 
 
     def on_key_up(self) -> None:
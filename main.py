@@ -13,11 +13,28 @@ from .actions.MediaActions.RepeatAction import Repeat
 from .actions.MediaActions.DeviceActions import SelectDevice
 from .actions.MediaActions.VolumeActions import VolumeDown, VolumeUp
 
+import atexit
+import os
+
 from loguru import logger as log
 import gi
 gi.require_version("Gtk" , "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw, Gdk
+from gi.repository import Gtk, Adw, Gdk, GLib
+
+SETTINGS_SAVE_DELAY_MS = 500  # Settings are written to disk once no edit came in for this long
+
+# (action id suffix, action name, action class) of every action the plugin registers
+ACTIONS = (
+    ("PlayPause", "Play/Pause", PlayResume),
+    ("Next", "Next Song", Next),
+    ("Previous", "Previous Song", Previous),
+    ("Shuffle", "Toggle Shuffle Mode", Shuffle),
+    ("Repeat", "Toggle Repeat Mode", Repeat),
+    ("VolumeUp", "Add 10 Percent to Playback Volume", VolumeUp),
+    ("VolumeDown", "Reduce Playback Volume by 10 Percent", VolumeDown),
+    ("SelectDevice", "Select Device from List", SelectDevice),
+)
 
 class SpotifyForStreamController(PluginBase):
     def __init__(self):
@@ -29,72 +46,27 @@ class SpotifyForStreamController(PluginBase):
         self.client_secret_row = None
         self.client_id_row = None
         self.auth_controller = AuthController(self)
+        # One settings dict shared with the AuthController; on_save writes it back debounced.
+        # Only touched on the main thread, the AuthController marshals token updates there
+        self._settings_cache = self.auth_controller.settings
+        self._save_source_id = None
+        atexit.register(self._flush_pending_settings)  # Edits made just before shutdown are still written
         self.controller = SpotifyController(self, self.auth_controller, 1)
+        # Icon paths resolved once and shared by all action instances
+        self.ASSETS = {
+            name: os.path.join(self.PATH, "assets", f"{name}.png")
+            for name in ("play", "pause", "next", "previous", "shuffle", "no_shuffle", "repeat", "repeat_one",
+                         "no_repeat", "volume_up", "volume_down", "media_output")
+        }
 
         ## Register actions
-        holder = ActionHolder(
-            plugin_base = self,
-            action_base = PlayResume,
-            action_id = "de_outsider_Spotify::PlayPause", # Change this to your own plugin id
-            action_name = "Play/Pause",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=Next,
-            action_id="de_outsider_Spotify::Next",  # Change this to your own plugin id
-            action_name="Next Song",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=Previous,
-            action_id="de_outsider_Spotify::Previous",  # Change this to your own plugin id
-            action_name="Previous Song",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=Shuffle,
-            action_id="de_outsider_Spotify::Shuffle",  # Change this to your own plugin id
-            action_name="Toggle Shuffle Mode",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=Repeat,
-            action_id="de_outsider_Spotify::Repeat",  # Change this to your own plugin id
-            action_name="Toggle Repeat Mode",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=VolumeUp,
-            action_id="de_outsider_Spotify::VolumeUp",  # Change this to your own plugin id
-            action_name="Add 10 Percent to Playback Volume",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=VolumeDown,
-            action_id="de_outsider_Spotify::VolumeDown",  # Change this to your own plugin id
-            action_name="Reduce Playback Volume by 10 Percent",
-        )
-        self.add_action_holder(holder)
-
-        holder = ActionHolder(
-            plugin_base=self,
-            action_base=SelectDevice,
-            action_id="de_outsider_Spotify::SelectDevice",  # Change this to your own plugin id
-            action_name="Select Device from List",
-        )
-        self.add_action_holder(holder)
+        for action_suffix, action_name, action_base in ACTIONS:
+            self.add_action_holder(ActionHolder(
+                plugin_base=self,
+                action_base=action_base,
+                action_id=f"de_outsider_Spotify::{action_suffix}",  # Change this to your own plugin id
+                action_name=action_name,
+            ))
 
         # Register plugin
         self.register(
@@ -123,7 +95,7 @@ class SpotifyForStreamController(PluginBase):
     def get_config_rows(self) -> list[Adw.PreferencesRow]:
         rows = []
 
-        settings = self.get_settings()  # Get existing settings
+        settings = self._settings_cache  # Includes edits that are not yet written to disk
 
         # String setting for client_id
         self.client_id_row = Adw.EntryRow(title="Client ID")
@@ -167,50 +139,65 @@ class SpotifyForStreamController(PluginBase):
 
         return rows
 
-    def handle_auth_code(self, code: str):
-        settings = self.get_settings()  # Get existing settings
+    def handle_auth_code(self, code: str) -> None:
+        settings = self._settings_cache
         settings["client_authorization"] = code
-        del settings["client_refresh_token"]
-        print(f"{self.plugin_name}: Client Secret entry has been modified.")
+        settings.pop("client_refresh_token", None)
+        log.debug("{}: Authorization code received.", self.plugin_name)
         self.on_save(settings)
+        # Redeem the code right away, off the main loop; the resulting tokens are saved by the AuthController
+        self.controller.run_in_background(self.auth_controller.exchange_code_for_token, code)
 
     def on_login(self, _):
         controller = self.get_auth_controller
         controller.initiate_login_flow()
 
     def on_save(self, settings):
-        self.set_settings(settings)
+        self._settings_cache = settings
+        self._schedule_save()
+
+    def _schedule_save(self):
+        # Debounced: every edit pushes the write back, it happens once the edits have settled
+        if self._save_source_id is not None:
+            GLib.source_remove(self._save_source_id)
+        self._save_source_id = GLib.timeout_add(SETTINGS_SAVE_DELAY_MS, self._flush_settings)
+
+    def _flush_pending_settings(self):
+        if self._save_source_id is not None:
+            GLib.source_remove(self._save_source_id)
+            self._flush_settings()
+
+    def _flush_settings(self):
+        self._save_source_id = None
+        # Before writing: a credential change drops the persisted access token from the settings
+        self.auth_controller.reload_credentials(self._settings_cache)
+        self.set_settings(self._settings_cache)
+        return GLib.SOURCE_REMOVE
 
     def _on_client_id_entry_changed(self, entry_row):
         # Store client id
-        settings = self.get_settings()  # Get existing settings
         client_id = entry_row.get_text()
-        settings["client_id"] = client_id
-        print(f"{self.plugin_name}: Client ID entry changed to: {client_id}")
-        self.on_save(settings)
+        self._settings_cache["client_id"] = client_id
+        log.debug("{}: Client ID entry has been modified.", self.plugin_name)
+        self._schedule_save()
 
     def _on_client_secret_entry_changed(self, entry_row):
         #  Store client secret
-        settings = self.get_settings()  # Get existing settings
         client_secret = entry_row.get_text()
-        settings["client_secret"] = client_secret
-        print(f"{self.plugin_name}: Client Secret entry has been modified.")
-        self.on_save(settings)
+        self._settings_cache["client_secret"] = client_secret
+        log.debug("{}: Client Secret entry has been modified.", self.plugin_name)
+        self._schedule_save()
 
     def _on_client_authorization_entry_changed(self, entry_row):
         #  Store client secret
-        settings = self.get_settings()  # Get existing settings
         client_secret = entry_row.get_text()
-        settings["client_authorization"] = client_secret
-        print(f"{self.plugin_name}: Client Secret entry has been modified.")
-        self.on_save(settings)
+        self._settings_cache["client_authorization"] = client_secret
+        log.debug("{}: Client Authorization entry has been modified.", self.plugin_name)
+        self._schedule_save()
 
     def _on_client_refresh_token_entry_changed(self, entry_row):
         #  Store client secret
-        settings = self.get_settings()  # Get existing settings
         client_secret = entry_row.get_text()
-        settings["client_refresh_token"] = client_secret
-        print(f"{self.plugin_name}: Client Refresh token entry has been modified.")
-        self.on_save(settings)
-
-
+        self._settings_cache["client_refresh_token"] = client_secret
+        log.debug("{}: Client Refresh token entry has been modified.", self.plugin_name)
+        self._schedule_save()
@@ -1,15 +1,25 @@
-import datetime
 import base64
 import threading
 import time  # For retry backoff
 import random  # For jitter
+import secrets  # For the OAuth state parameter
+from email.utils import parsedate_to_datetime  # For HTTP-date Retry-After values
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from functools import wraps
 from typing import Callable, Optional, Dict, Any, List, Tuple, TypeVar, ParamSpec
 from urllib import parse
 
+try:
+    import orjson as json_codec  # Optional, decodes the polled /me/player responses several times faster
+except ImportError:
+    import json as json_codec
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger as log
 
 # Assuming these gi imports and WebAuthWindow are correctly set up
@@ -17,11 +27,10 @@ import gi
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
-gi.require_version('WebKit', '6.0')  # Or WebKit2GTK for older GTK3/WebKit versions
-from gi.repository import Gtk, Adw, WebKit, Gio, GLib
+from gi.repository import GLib
+# WebAuthWindow (and with it WebKit) is imported in initiate_login_flow, loading WebKit is only worth it for a login
 
 # These are external dependencies, ensure they are correctly defined and available
-from .WebAuthWindow import WebAuthWindow  # Example relative import
 import globals as gl  # For gl.app
 
 # --- Constants ---
@@ -29,13 +38,65 @@ SPOTIFY_ACCOUNTS_URL = "https://accounts.spotify.com"
 SPOTIFY_API_URL = "https://api.spotify.com/v1"
 REDIRECT_URI = "https://stream-controller/callback"  # Ensure this is registered in your Spotify App
 DEFAULT_SCOPE = "user-read-playback-state user-modify-playback-state user-read-currently-playing"
+PROACTIVE_REFRESH_SECONDS = 300  # Refresh this long before expiry so requests never wait on it
+PLAYBACK_STATE_TTL_SECONDS = 1.0  # Bursts of /me/player lookups within this window share one response
+# Adaptive polling: poll right after the current track ends, but at least this often while playing
+MAX_PLAYING_POLL_INTERVAL_SECONDS = 5.0
+TRACK_END_POLL_BUFFER_SECONDS = 1.0
+PAUSED_POLL_INTERVAL_SECONDS = 30.0  # Nothing moves while paused or without an active device
+# After failed requests, poll every base + POLL_ERROR_BACKOFF_SECONDS * failures, at most POLL_ERROR_MAX_INTERVAL_SECONDS
+POLL_ERROR_BACKOFF_SECONDS = 5.0
+POLL_ERROR_MAX_INTERVAL_SECONDS = 60.0
+RECONCILE_POLL_DELAY_SECONDS = 0.75  # After a command, poll this soon to confirm the optimistic state
 
 TOKEN_ENDPOINT = f"{SPOTIFY_ACCOUNTS_URL}/api/token"
 AUTHORIZE_ENDPOINT = f"{SPOTIFY_ACCOUNTS_URL}/authorize"
 
 PLAYER_BASE_ENDPOINT = f"{SPOTIFY_API_URL}/me/player"
 DEVICES_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/devices"
-# ... (other specific API endpoints can be defined here if preferred over constructing them inline)
+PAUSE_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/pause"
+PLAY_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/play"
+NEXT_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/next"
+PREVIOUS_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/previous"
+SHUFFLE_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/shuffle"
+REPEAT_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/repeat"
+VOLUME_ENDPOINT = f"{PLAYER_BASE_ENDPOINT}/volume"
+
+# --- HTTP Connection Pooling ---
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 10
+HTTP_CONNECT_RETRIES = 3
+# (connect, read) seconds; keeps a stalled Spotify from holding a worker or poll cycle
+REQUEST_TIMEOUT = (3.05, 5.0)
+
+
+def create_http_session() -> requests.Session:
+    """
+    Creates a requests.Session with a pooled HTTPAdapter mounted for https://.
+    Reusing the session keeps TCP+TLS connections to Spotify alive between calls.
+    The adapter only retries failed connection attempts (the request was never sent, so this
+    is safe for PUT/POST too); status based retries (429/5xx) stay in spotify_api_request_handler
+    to avoid retrying twice.
+    """
+    session = requests.Session()
+    connect_retry = Retry(total=HTTP_CONNECT_RETRIES, connect=HTTP_CONNECT_RETRIES, read=0, status=0,
+                          backoff_factor=0.3)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                          max_retries=connect_retry)
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/json"  # Both Spotify hosts answer in JSON
+    return session
+
+
+# --- Background Execution ---
+# Blocking Spotify calls triggered from the GTK main thread (key presses, redraws) run here
+ACTION_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="SpotifyAction")
+
+
+def _invoke_on_main_thread(callback: Callable[[Any], Any], result: Any) -> bool:
+    callback(result)
+    return GLib.SOURCE_REMOVE  # Never reschedule, whatever the callback returned
+
 
 # --- Type Variables for Decorator ---
 P = ParamSpec('P')  # For the parameters of the decorated function
@@ -43,14 +104,29 @@ R = TypeVar('R')  # For the return type of the decorated function
 
 
 # --- Retry Decorator ---
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})  # Rate limiting and transient server errors
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parses a Retry-After header given as delay-seconds or as an HTTP-date. None if absent or malformed."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
 def spotify_api_request_handler(
         max_retries: int = 3,
         initial_backoff: float = 1.0,
-        max_backoff: float = 10.0,
-        jitter_factor: float = 0.1
+        max_backoff: float = 10.0
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
-    Decorator for Spotify API requests with retry logic, exponential backoff, and jitter.
+    Decorator for Spotify API requests with retry logic and exponential backoff with decorrelated jitter.
     It expects the decorated function to return a requests.Response object if retry
     logic is to be applied. If a non-Response object is returned, it's passed through.
     It will call response.raise_for_status() and handle retries for Response objects.
@@ -63,6 +139,7 @@ def spotify_api_request_handler(
             last_exception = None
 
             for attempt in range(max_retries):
+                retry_after = None  # Server-advertised delay of this attempt's 429/503, if any
                 try:
                     response_or_value = func(*args, **kwargs)
 
@@ -70,8 +147,9 @@ def spotify_api_request_handler(
                         # If the decorated function doesn't return a Response (e.g., early exit,
                         # or it's designed to return other data types),
                         # we shouldn't try to call raise_for_status or retry.
-                        log.debug(
-                            f"Function '{func.__name__}' did not return a requests.Response. Bypassing retry logic.")
+                        # Positional args: loguru only formats the message if DEBUG is enabled
+                        log.debug("Function '{}' did not return a requests.Response. Bypassing retry logic.",
+                                  func.__name__)
                         return response_or_value
 
                     # At this point, response_or_value is a requests.Response object
@@ -83,28 +161,41 @@ def spotify_api_request_handler(
                     # However, this is often acceptable given the isinstance check.
 
                 except requests.exceptions.HTTPError as e:
-                    # For 4xx client errors (except 429 Too Many Requests), don't retry.
-                    # 401/403 might indicate token issues that retrying won't fix here.
-                    # The calling code should handle token refresh based on these.
-                    if e.response is not None and 400 <= e.response.status_code < 500 and e.response.status_code != 429:
-                        log.warning(
-                            f"Client error {e.response.status_code} for {e.request.url} in '{func.__name__}'. No retry. Body: {e.response.text[:200]}")
+                    # Only rate limiting and transient server errors are retried. Anything else (e.g. 401/403,
+                    # which retrying won't fix here) is raised right away; the calling code handles token refresh.
+                    status_code = e.response.status_code if e.response is not None else None
+                    if status_code not in RETRYABLE_STATUS_CODES:
+                        # Positional args (and opt(lazy=True) for the body) defer formatting to loguru
+                        log.opt(lazy=True).warning(
+                            "HTTP error {} for {} in '{}'. No retry. Body: {}", lambda: status_code,
+                            lambda: e.request.url, lambda: func.__name__,
+                            lambda: e.response.text[:200] if e.response is not None else "")
                         raise  # Re-raise to be handled by the caller
-                    log.warning(
-                        f"Request '{func.__name__}' failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {current_backoff:.2f}s.")
+                    if status_code in (429, 503):
+                        retry_after = _retry_after_seconds(e.response)
+                        if retry_after is not None and retry_after > max_backoff:
+                            # Retrying any sooner is futile and waiting that long would stall the caller
+                            log.warning("'{}' got {} with Retry-After {:.0f}s, longer than {}s. No retry.",
+                                        func.__name__, status_code, retry_after, max_backoff)
+                            raise
+                    log.warning("Request '{}' failed (attempt {}/{}): {}.", func.__name__, attempt + 1, max_retries, e)
                     last_exception = e
                 except requests.exceptions.RequestException as e:  # Covers ConnectionError, Timeout, etc.
-                    log.warning(
-                        f"Request '{func.__name__}' failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {current_backoff:.2f}s.")
+                    log.warning("Request '{}' failed (attempt {}/{}): {}.", func.__name__, attempt + 1, max_retries, e)
                     last_exception = e
 
                 if attempt < max_retries - 1:
-                    jitter = random.uniform(-jitter_factor, jitter_factor) * current_backoff
-                    time.sleep(current_backoff + jitter)
-                    current_backoff = min(current_backoff * 2, max_backoff)  # Exponential backoff
+                    if retry_after is not None:
+                        current_backoff = retry_after  # The server knows when it will accept us again
+                    else:
+                        # Decorrelated jitter: draw from [initial_backoff, 3 * previous delay] (capped), so clients
+                        # that failed together spread their retries out instead of retrying in lockstep
+                        current_backoff = min(max_backoff, random.uniform(initial_backoff, current_backoff * 3))
+                    log.info("Retrying '{}' in {:.2f}s.", func.__name__, current_backoff)
+                    time.sleep(current_backoff)
 
             if last_exception:
-                log.error(f"Request '{func.__name__}' failed after {max_retries} retries: {last_exception}")
+                log.error("Request '{}' failed after {} retries: {}", func.__name__, max_retries, last_exception)
                 raise last_exception
 
             # This line should ideally not be reached if the decorated function always returns a value
@@ -140,18 +231,87 @@ class Device:
     volume_percent: int
     supports_volume: bool
 
+    @classmethod
+    def from_dict(cls, device_dict: Dict[str, Any]) -> "Device":
+        """Builds a Device from a Spotify device object. Raises KeyError if 'id' is missing."""
+        # The Spotify API often uses TitleCase for device types,
+        # so convert with .lower() before using DeviceType.from_string
+        device_type_str = device_dict.get("type", "unknown")  # Default to "unknown" if missing
+        # Using .get() for keys that might be missing to avoid KeyErrors
+        return cls(
+            id=device_dict["id"],  # Assuming 'id' is always present
+            is_active=device_dict.get("is_active", False),
+            is_private_session=device_dict.get("is_private_session", False),
+            is_restricted=device_dict.get("is_restricted", False),
+            name=device_dict.get("name", "Unknown Device"),
+            type=device_type_str,
+            volume_percent=device_dict.get("volume_percent"),  # Handles if volume_percent is null
+            supports_volume=device_dict.get("supports_volume", False)
+        )
+
+
+def _extract_album_art_url(state: Dict[str, Any]) -> Optional[str]:
+    item = state.get("item")
+    if not isinstance(item, dict): return None
+
+    album = item.get("album")
+    if not isinstance(album, dict): return None
+
+    images = album.get("images")
+    if not isinstance(images, list) or not images: return None
+
+    image_obj = images[0]  # Assuming the first image (often largest or a good default)
+    return image_obj.get("url") if isinstance(image_obj, dict) else None
+
+
+def _state_fingerprint(state: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    The fields the actions render, as one comparable tuple. Timestamp and progress are left out:
+    they move without anything on the keys changing.
+    """
+    item = state.get("item") or {}  # None for ads and while switching tracks
+    device = state.get("device") or {}
+    return (item.get("id"), state.get("is_playing"), state.get("shuffle_state"),
+            state.get("repeat_state"), device.get("id"), device.get("volume_percent"))
+
+
+@dataclass(frozen=True)
+class PlayerState:
+    """The fields of a single /me/player response that the actions render. Shared, hence frozen."""
+    is_playing: bool
+    album_art_url: Optional[str]
+    repeat_state: Optional[str]  # "track", "context", or "off"
+    device: Optional[Device]
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "PlayerState":
+        device_dict = state.get("device")
+        device = None
+        if isinstance(device_dict, dict) and device_dict.get("id"):
+            device = Device.from_dict(device_dict)
+        return cls(
+            is_playing=bool(state.get("is_playing")),
+            album_art_url=_extract_album_art_url(state),
+            repeat_state=state.get("repeat_state"),
+            device=device
+        )
+
 # --- Token Class ---
 class Token:
     def __init__(self, token_string: str, expires_in: int):
         self.token_string = token_string
+        # Built once per token and passed by reference to every API call; treat as read-only
+        self.api_headers: Dict[str, str] = {"Authorization": f"Bearer {token_string}"}
         # expires_in is in seconds. Add a small buffer (e.g., 60s) to consider it expired earlier.
+        # time.monotonic() is immune to wall-clock jumps (NTP, DST) and cheaper than datetime.now().
         buffer_seconds = 60
-        self.expires_at = datetime.datetime.now() + datetime.timedelta(seconds=max(0, expires_in - buffer_seconds))
-        log.debug(f"New token created, expires at {self.expires_at.isoformat()}")
+        lifetime = max(0, expires_in - buffer_seconds)
+        self.expires_at = time.monotonic() + lifetime
+        log.debug(f"New token created, considered valid for {lifetime}s")
 
     @property
     def is_valid(self) -> bool:
-        return datetime.datetime.now() < self.expires_at
+        return time.monotonic() < self.expires_at
 
     @property
     def value(self) -> str:
@@ -164,6 +324,59 @@ class AuthController:
         self.access_token_obj: Optional[Token] = None
         self.plugin_base = plugin_base
         self.settings = plugin_base.get_settings()  # Expects a dict-like object
+        self._session = create_http_session()  # Keep-alive connection to the accounts endpoint
+        # Token endpoint headers, rebuilt only when client_id/client_secret change
+        self._token_headers: Dict[str, str] = {}
+        self._token_headers_credentials: Optional[Tuple[str, str]] = None
+        # Urlencoded refresh_token grant body, rebuilt only when the refresh token or client_id change
+        self._refresh_body: str = ""
+        self._refresh_body_params: Optional[Tuple[str, str]] = None
+        # Concurrent callers share a single in-flight refresh instead of each POSTing to the token endpoint
+        self._refresh_lock = threading.RLock()  # Reentrant: done callbacks may run while the lock is held
+        self._refresh_future: Optional[Future] = None
+        self._refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SpotifyTokenRefresh")
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._login_window = None  # WebAuthWindow of the login in progress, if any
+        self._credentials = self._get_client_credentials()  # Those the current token was issued for
+        # Bumped whenever the client credentials change; token responses to older requests are discarded
+        self._credentials_generation = 0
+        self._restore_cached_token()
+
+    def _restore_cached_token(self):
+        """Reuses the access token persisted by _process_token_response, skipping the refresh round trip after a reload."""
+        access_token_str = self.settings.get("access_token")
+        expires_at = self.settings.get("access_token_expires_at")  # Wall-clock epoch seconds, survives restarts
+        if not access_token_str or not isinstance(expires_at, (int, float)):
+            return
+        expires_in = int(expires_at - time.time())
+        token = Token(token_string=access_token_str, expires_in=expires_in)
+        if not token.is_valid:
+            log.debug("Persisted access token has expired, it will be refreshed on first use.")
+            return
+        self.access_token_obj = token
+        self._schedule_proactive_refresh(expires_in)
+        log.info("Restored persisted access token.")
+
+    def reload_credentials(self, settings: Dict[str, Any]):
+        """
+        Adopts edited settings in place; the session, token and refresh state are kept
+        unless the client credentials changed, in which case the token is dropped.
+        """
+        self.settings = settings
+        credentials = self._get_client_credentials()
+        if credentials == self._credentials:
+            return
+        self._credentials = credentials
+        with self._refresh_lock:
+            self._credentials_generation += 1
+            self._refresh_future = None  # A refresh still in flight belongs to the old client, don't join it
+            self.access_token_obj = None
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+                self._refresh_timer = None
+        self.settings.pop("access_token", None)
+        self.settings.pop("access_token_expires_at", None)
+        log.info("Client credentials changed, the access token will be requested again.")
 
     def _get_client_credentials(self) -> Tuple[Optional[str], Optional[str]]:
         client_id = self.settings.get("client_id")
@@ -174,8 +387,29 @@ class AuthController:
         credentials = f"{client_id}:{client_secret}"
         return base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
 
+    def _get_token_headers(self, client_id: str, client_secret: str) -> Dict[str, str]:
+        credentials = (client_id, client_secret)
+        if credentials != self._token_headers_credentials:
+            self._token_headers = {
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": f"Basic {self._encode_basic_auth(client_id, client_secret)}"
+            }
+            self._token_headers_credentials = credentials
+        return self._token_headers
+
+    def _get_refresh_body(self, refresh_token: str, client_id: str) -> str:
+        params = (refresh_token, client_id)
+        if params != self._refresh_body_params:
+            self._refresh_body = parse.urlencode({
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": client_id,  # Spotify requires client_id in the body for refresh token grant
+            })
+            self._refresh_body_params = params
+        return self._refresh_body
+
     @spotify_api_request_handler()
-    def _request_token_from_spotify(self, data: Dict[str, str]) -> requests.Response:
+    def _request_token_from_spotify(self, data: Dict[str, str] | str, grant_type: str) -> requests.Response:
         """Internal method to request an access token, decorated for retries."""
         client_id, client_secret = self._get_client_credentials()
         if not client_id or not client_secret:
@@ -185,15 +419,11 @@ class AuthController:
             # Return a dummy response or raise to prevent decorator from proceeding without valid request
             raise ValueError("Client ID or Client Secret is missing for token request")
 
-        b64_creds = self._encode_basic_auth(client_id, client_secret)
-        headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": f"Basic {b64_creds}"
-        }
-        log.debug(f"Requesting token from {TOKEN_ENDPOINT} with grant_type: {data.get('grant_type')}")
-        return requests.post(TOKEN_ENDPOINT, headers=headers, data=data, timeout=10)
+        headers = self._get_token_headers(client_id, client_secret)
+        log.debug("Requesting token from {} with grant_type: {}", TOKEN_ENDPOINT, grant_type)
+        return self._session.post(TOKEN_ENDPOINT, headers=headers, data=data, timeout=REQUEST_TIMEOUT)
 
-    def _process_token_response(self, response_data: Dict[str, Any], grant_type: str) -> bool:
+    def _process_token_response(self, response_data: Dict[str, Any], grant_type: str, generation: int) -> bool:
         access_token_str = response_data.get("access_token")
         expires_in = response_data.get("expires_in")
 
@@ -201,24 +431,67 @@ class AuthController:
             log.error(f"Access token or expires_in missing/invalid in {grant_type} response.")
             return False
 
-        self.access_token_obj = Token(token_string=access_token_str, expires_in=expires_in)
+        with self._refresh_lock:
+            if generation != self._credentials_generation:
+                log.info("Discarding {} response requested with the previous client credentials.", grant_type)
+                return False
+            self.access_token_obj = Token(token_string=access_token_str, expires_in=expires_in)
+            self._schedule_proactive_refresh(expires_in)
+        # Persisted with the settings so a plugin reload can reuse it, see _restore_cached_token
+        updates = {
+            "access_token": access_token_str,
+            "access_token_expires_at": time.time() + expires_in,
+        }
 
         # Spotify may issue a new refresh token. It's guaranteed on auth_code grant.
         new_refresh_token = response_data.get("refresh_token")
         if new_refresh_token:
-            self.settings["client_refresh_token"] = new_refresh_token
+            updates["client_refresh_token"] = new_refresh_token
             log.info("New refresh token received and stored in settings.")
 
         # If this was an authorization_code grant, clear the used code
-        if grant_type == "authorization_code":
-            if "client_authorization" in self.settings:
-                del self.settings["client_authorization"]  # Or set to None
-                log.info("Authorization code cleared from settings after successful use.")
+        removals = ("client_authorization",) if grant_type == "authorization_code" else ()
 
-        self.plugin_base.on_save(self.settings)  # Persist changes
+        self._update_settings(updates, removals, generation)  # Persist changes
         log.info(f"Successfully obtained and processed new access token via {grant_type}.")
         return True
 
+    def _update_settings(self, updates: Dict[str, Any], removals: Tuple[str, ...], generation: int):
+        """
+        Applies token bookkeeping to the shared settings dict on the main thread, the only thread
+        that edits and saves it (see main.py); token requests run on worker and timer threads.
+        """
+        GLib.idle_add(self._apply_settings_update, updates, removals, generation)
+
+    def _apply_settings_update(self, updates: Dict[str, Any], removals: Tuple[str, ...], generation: int) -> bool:
+        if generation == self._credentials_generation:  # Else the credentials changed after the request was sent
+            self.settings.update(updates)
+            for key in removals:
+                self.settings.pop(key, None)
+            self.plugin_base.on_save(self.settings)
+        return GLib.SOURCE_REMOVE
+
+    def _schedule_proactive_refresh(self, expires_in: int):
+        """Schedules a background refresh shortly before the new token expires."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        delay = expires_in - PROACTIVE_REFRESH_SECONDS
+        if delay <= 0:
+            return  # Token too short-lived, lazy refresh in get_valid_token handles it
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+        log.debug(f"Proactive token refresh scheduled in {delay}s.")
+
+    def _background_refresh(self):
+        log.info("Proactively refreshing access token before it expires.")
+        try:
+            if not self._refresh_access_token_deduplicated(force=True):
+                log.warning("Proactive token refresh failed. Falling back to refresh on demand.")
+        except Exception as e:
+            log.error(f"Proactive token refresh raised: {e}. Falling back to refresh on demand.")
+
     def exchange_code_for_token(self, authorization_code: str) -> bool:
         """Exchanges an authorization code for an access token and refresh token."""
         if not authorization_code:
@@ -230,6 +503,7 @@ class AuthController:
             log.error("Client ID is missing in settings. Cannot exchange code for token.")
             return False
 
+        generation = self._credentials_generation
         data = {
             "grant_type": "authorization_code",
             "code": authorization_code,
@@ -237,8 +511,9 @@ class AuthController:
             # "client_id": client_id, # Not needed in body if Basic Auth is used
         }
         try:
-            response = self._request_token_from_spotify(data)
-            return self._process_token_response(response.json(), "authorization_code")
+            response = self._request_token_from_spotify(data, "authorization_code")
+            return self._process_token_response(json_codec.loads(response.content), "authorization_code",
+                                                generation)
         except requests.RequestException as e:
             log.error(f"Failed to exchange authorization code for token: {e}")
             if hasattr(e, 'response') and e.response is not None:
@@ -249,6 +524,7 @@ class AuthController:
 
     def refresh_access_token(self) -> bool:
         """Refreshes an expired access token using a refresh token."""
+        generation = self._credentials_generation  # Read before any credential, see _process_token_response
         current_refresh_token = self.settings.get("client_refresh_token")
         client_id, _ = self._get_client_credentials()  # client_id is required for refresh token grant by Spotify
 
@@ -259,44 +535,68 @@ class AuthController:
             log.error("Client ID is missing. Cannot refresh access token (required in request body).")
             return False
 
-        data = {
-            "grant_type": "refresh_token",
-            "refresh_token": current_refresh_token,
-            "client_id": client_id,  # Spotify requires client_id in the body for refresh token grant
-        }
+        data = self._get_refresh_body(current_refresh_token, client_id)  # Already urlencoded
         log.info("Attempting to refresh access token...")
         try:
-            response = self._request_token_from_spotify(data)
-            return self._process_token_response(response.json(), "refresh_token")
+            response = self._request_token_from_spotify(data, "refresh_token")
+            return self._process_token_response(json_codec.loads(response.content), "refresh_token", generation)
         except requests.RequestException as e:
             log.error(f"Failed to refresh access token: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 log.error(f"Response details: Status {e.response.status_code}, Body: {e.response.text[:200]}")
                 # If refresh token is invalid (e.g., 400 Bad Request with specific error), clear it
                 if e.response.status_code == 400:
-                    error_payload = e.response.json()
-                    if error_payload.get("error") == "invalid_grant":
+                    # A ValueError raised in this handler would escape the 'except ValueError' below
+                    try:
+                        error_payload = json_codec.loads(e.response.content)
+                    except ValueError:
+                        error_payload = {}
+                    if isinstance(error_payload, dict) and error_payload.get("error") == "invalid_grant":
                         log.warning("Refresh token is invalid. Clearing it from settings.")
-                        self.settings["client_refresh_token"] = None
-                        self.plugin_base.on_save(self.settings)
+                        self._update_settings({"client_refresh_token": None}, (), generation)
                         # Potentially trigger a new full login flow here if appropriate for the app
         except ValueError as e:  # JSONDecodeError
             log.error(f"Error processing token response (refresh grant): {e}")
         return False
 
-    def get_valid_token_string(self) -> Optional[str]:
+    def _clear_refresh_future(self, future: Future):
+        with self._refresh_lock:
+            if self._refresh_future is future:
+                self._refresh_future = None
+
+    def _refresh_access_token_deduplicated(self, force: bool = False) -> bool:
         """
-        Provides a valid access token string.
+        Runs refresh_access_token on the refresh executor. Callers arriving while a
+        refresh is in flight wait on the same Future, so N concurrent callers cause 1 request.
+        """
+        with self._refresh_lock:
+            # Refreshed while we waited for the lock; a forced (proactive) refresh replaces a still-valid token
+            if not force and self.access_token_obj and self.access_token_obj.is_valid:
+                return True
+            future = self._refresh_future
+            if future is None:
+                future = self._refresh_executor.submit(self.refresh_access_token)
+                self._refresh_future = future
+                future.add_done_callback(self._clear_refresh_future)
+            else:
+                log.debug("Token refresh already in flight, waiting for its result.")
+        return future.result()
+
+    def get_valid_token(self) -> Optional[Token]:
+        """
+        Provides a valid Token object.
         Checks current token, tries to refresh if invalid/missing.
         Does NOT handle initial code exchange; that's triggered by plugin_base.handle_auth_code -> exchange_code_for_token.
         """
-        if self.access_token_obj and self.access_token_obj.is_valid:
-            return self.access_token_obj.value
+        token = self.access_token_obj
+        if token is not None and token.is_valid:  # Fast path: no settings lookups, no formatting
+            return token
 
         log.info("Access token is invalid or missing. Attempting to refresh.")
-        if self.refresh_access_token():  # This updates self.access_token_obj on success
-            if self.access_token_obj and self.access_token_obj.is_valid:  # Double check after refresh
-                return self.access_token_obj.value
+        if self._refresh_access_token_deduplicated():  # This updates self.access_token_obj on success
+            token = self.access_token_obj
+            if token is not None and token.is_valid:  # Double check after refresh
+                return token
             else:
                 log.error("Token refresh reported success, but token object is still invalid or None.")
         else:
@@ -305,6 +605,33 @@ class AuthController:
         log.error("Unable to obtain a valid access token via refresh.")
         return None
 
+    def replace_rejected_token(self, rejected_headers: Dict[str, str]) -> bool:
+        """
+        Refreshes the token whose api_headers Spotify rejected. Concurrent callers holding the
+        same rejected token share one refresh; a token that was replaced meanwhile is kept.
+        """
+        with self._refresh_lock:
+            token = self.access_token_obj
+            if token is not None and token.api_headers is not rejected_headers:
+                return token.is_valid  # Already replaced since the rejected request was sent
+            self.access_token_obj = None
+            # Also forget the persisted copy, or a restart would restore the token Spotify just rejected
+            self._update_settings({}, ("access_token", "access_token_expires_at"), self._credentials_generation)
+        return self._refresh_access_token_deduplicated()
+
+    def get_valid_token_string(self) -> Optional[str]:
+        """Provides a valid access token string, see get_valid_token."""
+        token = self.get_valid_token()
+        return token.value if token else None
+
+    def get_api_headers(self) -> Optional[Dict[str, str]]:
+        """Provides the prebuilt Authorization headers of a valid token. Do not mutate the returned dict."""
+        token = self.get_valid_token()
+        return token.api_headers if token else None
+
+    def _on_login_error(self, error: str) -> None:
+        log.error(f"Spotify authorization was not completed: {error}. Please press 'Login' again.")
+
     def initiate_login_flow(self):
         """Initiates the Spotify OAuth authorization flow via WebAuthWindow."""
         client_id = self.settings.get("client_id")
@@ -313,27 +640,44 @@ class AuthController:
             # Optionally, notify the user through plugin_base or raise an error
             return
 
+        if self._login_window is not None and self._login_window.webview is not None:
+            # A login is already open (its WebView is released on close), raise it instead of starting a second one
+            self._login_window.present()
+            return
+
+        state = secrets.token_urlsafe(16)  # Echoed back by Spotify, verified by WebAuthWindow
         params = {
             "response_type": "code",
             "client_id": client_id,
             "redirect_uri": REDIRECT_URI,
-            "scope": DEFAULT_SCOPE
+            "scope": DEFAULT_SCOPE,
+            "state": state
             # Consider adding "show_dialog": "true" if you always want user to re-approve
         }
         encoded_params = parse.urlencode(params)
+        initial_url = f"{AUTHORIZE_ENDPOINT}?{encoded_params}"
 
         if not gl.app:  # Ensure gl.app is a valid Gtk.Application or Adw.Application instance
             log.error("Gtk.Application instance (gl.app) not available for WebAuthWindow.")
             return
 
-        web_auth_window = WebAuthWindow(
-            application=gl.app,
-            initial_url=f"{AUTHORIZE_ENDPOINT}?{encoded_params}",
-            modal=True,
-            # This callback in plugin_base is responsible for getting the auth code
-            # and then calling self.auth_controller.exchange_code_for_token(code).
-            callback=self.plugin_base.handle_auth_code
-        )
+        from .WebAuthWindow import WebAuthWindow  # Deferred: pulls in WebKit
+
+        try:
+            web_auth_window = self._login_window = WebAuthWindow(
+                application=gl.app,
+                initial_url=initial_url,
+                modal=True,
+                # This callback in plugin_base is responsible for getting the auth code
+                # and then calling self.auth_controller.exchange_code_for_token(code).
+                callback=self.plugin_base.handle_auth_code,
+                error_callback=self._on_login_error,
+                expected_state=state
+            )
+        except ValueError as e:  # Rejected login URL, raised before the window is built
+            log.error(f"Refusing to open the login window: {e}")
+            self._on_login_error("invalid_url")
+            return
         web_auth_window.present()
         log.info("WebAuthWindow presented for Spotify login.")
 
@@ -343,55 +687,135 @@ class SpotifyController:
     def __init__(self, plugin_base: Any, auth_controller: AuthController, update_interval_seconds: int = 2):
         self.plugin_base = plugin_base
         self.auth_controller = auth_controller  # Injected AuthController instance
-        self.update_callbacks: List[Callable[[Optional[Dict[str, Any]]], None]] = []
+        self._session = create_http_session()  # Keep-alive connection to the Web API
+        # Insertion-ordered sets (dict keys): O(1) membership and removal, callbacks still run in registration order
+        self.update_callbacks: Dict[Callable[[Optional[Dict[str, Any]]], None], None] = {}
+        # Per-field subscribers of the polled state, see subscribe
+        self._subscribers: Dict[str, Dict[Callable[[Any], None], None]] = defaultdict(dict)
+        self._published_values: Dict[str, Any] = {}
         self.latest_playback_state: Optional[Dict[str, Any]] = None
+        self._latest_fingerprint: Optional[Tuple[Any, ...]] = None  # _state_fingerprint of latest_playback_state
+        # (state dict, PlayerState parsed from it); states are replaced, never mutated, so identity is enough
+        self._player_state_memo: Optional[Tuple[Dict[str, Any], PlayerState]] = None
+        # (monotonic fetch time, state) of the last /me/player response, see get_playback_state
+        self._state_cache: Optional[Tuple[float, Optional[Dict[str, Any]]]] = None
+        # Concurrent get_playback_state misses share a single in-flight /me/player request
+        self._state_fetch_lock = threading.Lock()
+        self._state_fetch_future: Optional[Future] = None
+        self._consecutive_fetch_failures = 0  # Backs off polling while Spotify is unreachable
+        # (conditional request headers, state) from the last 200 that carried an ETag or Last-Modified
+        self._validated_state: Optional[Tuple[Dict[str, str], Dict[str, Any]]] = None
 
         self._update_interval = update_interval_seconds
         self._polling_thread: Optional[threading.Thread] = None
         self._stop_polling_event = threading.Event()
+        self._poll_wakeup_event = threading.Event()  # Interrupts the wait between polls, see request_reconcile_poll
+        self._reconcile_poll_at: Optional[float] = None
+        self._local_change_seq = 0  # Bumped by _apply_local_change; polls that started earlier are discarded
 
         # Consider auto-starting polling or requiring an explicit start
         self.start_polling_updates()
 
-    @spotify_api_request_handler(max_retries=2, initial_backoff=0.5)  # Shorter retries for playback state
     def _make_api_request(self, method: str, endpoint_url: str, **kwargs) -> Optional[requests.Response]:
-        """Helper to make authenticated requests to Spotify API, decorated for retries."""
-        token_str = self.auth_controller.get_valid_token_string()
-        if not token_str:
+        """
+        Helper to make authenticated requests to Spotify API. The token is sent as-is; should Spotify
+        reject it (401), it is refreshed and the request is sent once more.
+        """
+        auth_headers = self.auth_controller.get_api_headers()
+        if not auth_headers:
             log.warning(f"Cannot make API request to {endpoint_url}: No valid token.")
             return None  # Propagate that token is unavailable
 
-        headers = kwargs.pop("headers", {})
-        headers["Authorization"] = f"Bearer {token_str}"
+        try:
+            return self._send_api_request(method, endpoint_url, auth_headers, **kwargs)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 401:
+                raise  # Already logged by the decorator
+            log.warning(f"Access token rejected (401) calling {endpoint_url}. Refreshing it and retrying once.")
+            if not self.auth_controller.replace_rejected_token(auth_headers):
+                raise
+            auth_headers = self.auth_controller.get_api_headers()
+            if not auth_headers:
+                raise
+            return self._send_api_request(method, endpoint_url, auth_headers, **kwargs)
+
+    @spotify_api_request_handler(max_retries=2, initial_backoff=0.5)  # Shorter retries for playback state
+    def _send_api_request(self, method: str, endpoint_url: str, auth_headers: Dict[str, str],
+                          **kwargs) -> requests.Response:
+        extra_headers = kwargs.pop("headers", None)
+        headers = {**auth_headers, **extra_headers} if extra_headers else auth_headers
 
-        log.trace(f"Making Spotify API request: {method} {endpoint_url}")
+        log.trace("Making Spotify API request: {} {}", method, endpoint_url)
         # The decorator will handle requests.request and raise_for_status
+        # kwargs might include 'params' for GET or 'json'/'data' for POST/PUT
+        return self._session.request(method, endpoint_url, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs)
+
+    def get_playback_state(self, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Fetches the current playback state from Spotify.
+        Responses are memoized for PLAYBACK_STATE_TTL_SECONDS unless force_refresh is set.
+        Callers arriving while a fetch is in flight wait for its result instead of sending their own.
+        """
+        cached = self._state_cache
+        if not force_refresh and cached is not None and time.monotonic() - cached[0] < PLAYBACK_STATE_TTL_SECONDS:
+            return cached[1]
+
+        with self._state_fetch_lock:
+            future = self._state_fetch_future
+            is_owner = future is None
+            if is_owner:
+                future = self._state_fetch_future = Future()
+        if not is_owner:
+            log.trace("Playback state fetch already in flight, waiting for its result.")
+            return future.result()
+
+        state = None
         try:
-            # kwargs might include 'params' for GET or 'json'/'data' for POST/PUT
-            return requests.request(method, endpoint_url, headers=headers, timeout=10, **kwargs)
-        except requests.exceptions.HTTPError as e:
-            if e.response is not None and e.response.status_code in (401, 403):
-                log.warning(
-                    f"Authentication/Authorization error ({e.response.status_code}) calling {endpoint_url}. Token might be revoked.")
-                # Invalidate local token object to force refresh on next attempt
-                self.auth_controller.access_token_obj = None
-                # The decorator has already logged and will re-raise.
-            # We catch here primarily to act on specific auth errors if needed,
-            # otherwise, let the decorator's re-raise propagate.
-            raise
-        except requests.RequestException:
-            # Already logged by decorator, re-raised.
-            raise
-
-    def get_playback_state(self) -> Optional[Dict[str, Any]]:
-        """Fetches the current playback state from Spotify."""
+            state = self._fetch_playback_state()
+        finally:
+            with self._state_fetch_lock:
+                if self._state_fetch_future is future:  # Not invalidated while fetching
+                    self._state_fetch_future = None
+                    self._state_cache = (time.monotonic(), state)
+            future.set_result(state)
+        return state
+
+    def _store_validators(self, response: requests.Response, state: Dict[str, Any]):
+        """Remembers ETag / Last-Modified so the next fetch can be answered with a bodiless 304."""
+        conditional_headers = {}
+        etag = response.headers.get("ETag")
+        if etag:
+            conditional_headers["If-None-Match"] = etag
+        last_modified = response.headers.get("Last-Modified")
+        if last_modified:
+            conditional_headers["If-Modified-Since"] = last_modified
+        self._validated_state = (conditional_headers, state) if conditional_headers else None
+
+    def invalidate_playback_state(self):
+        """Drops the memoized playback state, e.g. after a control command changed it."""
+        with self._state_fetch_lock:
+            self._state_cache = None
+            self._state_fetch_future = None  # Later callers must not join a fetch that predates the change
+        self._validated_state = None
+
+    def _fetch_playback_state(self) -> Optional[Dict[str, Any]]:
         try:
-            response = self._make_api_request("GET", PLAYER_BASE_ENDPOINT)
+            validated = self._validated_state
+            response = self._make_api_request("GET", PLAYER_BASE_ENDPOINT,
+                                              headers=validated[0] if validated else None)
             if response:
+                if response.status_code == 304 and validated:  # Not modified, no body to download or decode
+                    self._consecutive_fetch_failures = 0
+                    return validated[1]
                 if response.status_code == 200:  # State returned
-                    return response.json()
+                    state = json_codec.loads(response.content)
+                    self._consecutive_fetch_failures = 0
+                    self._store_validators(response, state)
+                    return state
                 elif response.status_code == 204:  # No active device / content
-                    log.info("No active Spotify device or content playing (204).")
+                    log.debug("No active Spotify device or content playing (204).")
+                    self._consecutive_fetch_failures = 0
+                    self._validated_state = None
                     return None  # Represent as no state (e.g., player closed or idle)
                 # Other status codes are handled by raise_for_status in decorator
             return None  # If _make_api_request returned None (e.g. no token)
@@ -399,6 +823,7 @@ class SpotifyController:
             log.error(f"Error fetching playback state: {e}")
         except ValueError:  # JSONDecodeError
             log.error("Error decoding JSON from get_playback_state response.")
+        self._consecutive_fetch_failures += 1
         return None
 
     def _get_current_or_fresh_state(self, provided_state: Optional[Dict]) -> Optional[Dict]:
@@ -416,24 +841,55 @@ class SpotifyController:
 
     def get_playback_art_url(self, state: Optional[Dict] = None) -> Optional[str]:
         current_state = self._get_current_or_fresh_state(state)
-        if not current_state: return None
-
-        item = current_state.get("item")
-        if not isinstance(item, dict): return None
+        return _extract_album_art_url(current_state) if current_state else None
 
-        album = item.get("album")
-        if not isinstance(album, dict): return None
-
-        images = album.get("images")
-        if not isinstance(images, list) or not images: return None
+    def get_player_state(self, state: Optional[Dict] = None) -> Optional[PlayerState]:
+        """Returns play state, album art, repeat mode and device from a single /me/player response."""
+        current_state = self._get_current_or_fresh_state(state)
+        if not current_state:
+            return None
+        memo = self._player_state_memo
+        if memo is not None and memo[0] is current_state:  # Parsed this very response before
+            return memo[1]
+        player_state = PlayerState.from_state(current_state)
+        self._player_state_memo = (current_state, player_state)
+        return player_state
+
+    def fetch_resource(self, url: str, **kwargs) -> requests.Response:
+        """GETs a non-API resource (e.g. album art) over the pooled session, without auth headers."""
+        kwargs.setdefault("headers", {"Accept": "*/*"})  # Overrides the session's JSON Accept header
+        return self._session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+
+    def run_in_background(self, func: Callable[..., R], *args: Any,
+                          on_done: Optional[Callable[[R], Any]] = None,
+                          on_error: Optional[Callable[[Exception], Any]] = None) -> Future:
+        """
+        Runs func(*args) on ACTION_EXECUTOR so HTTP round trips never block the GTK main loop.
+        If on_done is given, it is called with the result on the main thread via GLib.idle_add;
+        if func raises, on_error (if given) is called with the exception there instead.
+        """
+        name = getattr(func, '__name__', repr(func))
 
-        image_obj = images[0]  # Assuming the first image (often largest or a good default)
-        return image_obj.get("url") if isinstance(image_obj, dict) else None
+        def _deliver(future: Future):
+            try:
+                result = future.result()
+            except Exception as e:
+                log.error(f"Background task {name} failed: {e}")
+                if on_error is not None:
+                    GLib.idle_add(_invoke_on_main_thread, on_error, e)
+                return
+            if on_done is not None:
+                GLib.idle_add(_invoke_on_main_thread, on_done, result)
+
+        future = ACTION_EXECUTOR.submit(func, *args)
+        future.add_done_callback(_deliver)
+        return future
 
     # --- Playback Control Methods --- (Return True on success, False on failure/error)
     def _control_playback(self, method: str, endpoint: str, **kwargs) -> bool:
         try:
             response = self._make_api_request(method, endpoint, **kwargs)
+            self.invalidate_playback_state()
             # Spotify usually returns 204 No Content for successful control actions
             return response is not None and response.status_code == 204
         except requests.RequestException as e:
@@ -441,43 +897,61 @@ class SpotifyController:
             return False
 
     def pause(self) -> bool:
-        return self._control_playback("PUT", f"{PLAYER_BASE_ENDPOINT}/pause")
+        if not self._control_playback("PUT", PAUSE_ENDPOINT):
+            return False
+        self._apply_local_change(is_playing=False)
+        return True
 
     def play(self) -> bool:
         # Spotify might need a device_id if no active device.
         # For simplicity, this assumes a device is active or Spotify handles it.
-        return self._control_playback("PUT", f"{PLAYER_BASE_ENDPOINT}/play")
+        if not self._control_playback("PUT", PLAY_ENDPOINT):
+            return False
+        self._apply_local_change(is_playing=True)
+        return True
 
     def next_track(self) -> bool:
-        return self._control_playback("POST", f"{PLAYER_BASE_ENDPOINT}/next")
+        success = self._control_playback("POST", NEXT_ENDPOINT)
+        if success:
+            self.request_reconcile_poll()  # The new track is only known to Spotify
+        return success
 
     def previous_track(self) -> bool:
-        return self._control_playback("POST", f"{PLAYER_BASE_ENDPOINT}/previous")
+        success = self._control_playback("POST", PREVIOUS_ENDPOINT)
+        if success:
+            self.request_reconcile_poll()
+        return success
 
     def toggle_shuffle(self) -> Optional[bool]:
-        current_shuffle_state = self.get_shuffle_state(self.latest_playback_state)  # Try cached first
-        if current_shuffle_state is None:  # Still None, try a fresh API call
-            current_shuffle_state = self.get_shuffle_state()
-
+        # One lookup: the polled state if there is one, otherwise a single fresh fetch
+        current_shuffle_state = self.get_shuffle_state()
         if current_shuffle_state is None:
             log.warning("Could not determine current shuffle state to toggle.")
             return None
 
         new_target_state_bool = not current_shuffle_state
-        success = self._control_playback("PUT", f"{PLAYER_BASE_ENDPOINT}/shuffle",
+        success = self._control_playback("PUT", SHUFFLE_ENDPOINT,
                                          params={"state": str(new_target_state_bool).lower()})
-        return new_target_state_bool if success else None
+        if not success:
+            return None
+        self._apply_local_change(shuffle_state=new_target_state_bool)
+        return new_target_state_bool
 
     def set_repeat_state(self, target_repeat_state: str) -> bool:  # "track", "context", or "off"
         if target_repeat_state not in ["track", "context", "off"]:
             log.error(f"Invalid repeat state: {target_repeat_state}.")
             return False
-        return self._control_playback("PUT", f"{PLAYER_BASE_ENDPOINT}/repeat", params={"state": target_repeat_state})
+        if not self._control_playback("PUT", REPEAT_ENDPOINT, params={"state": target_repeat_state}):
+            return False
+        self._apply_local_change(repeat_state=target_repeat_state)
+        return True
 
     def set_volume(self, volume_percent: int) -> bool:
         limited_volume = min(max(volume_percent, 0), 100)
-        return self._control_playback("PUT", f"{PLAYER_BASE_ENDPOINT}/volume",
-                                      params={"volume_percent": limited_volume})
+        if not self._control_playback("PUT", VOLUME_ENDPOINT, params={"volume_percent": limited_volume}):
+            return False
+        self._apply_local_change(device_fields={"volume_percent": limited_volume})
+        return True
 
     def get_shuffle_state(self, state: Optional[Dict] = None) -> Optional[bool]:
         current_state = self._get_current_or_fresh_state(state)
@@ -498,25 +972,25 @@ class SpotifyController:
     # --- Polling Logic ---
     def _perform_update_and_notify(self):
         log.trace("Polling for Spotify playback state update...")
-        new_state = self.get_playback_state()  # This handles its own token needs and request errors
+        local_change_seq = self._local_change_seq
+        new_state = self.get_playback_state(force_refresh=True)  # This handles its own token needs and request errors
+        if local_change_seq != self._local_change_seq:
+            # A command changed the state while this poll was in flight; its response may predate the
+            # command and would undo the optimistic state. The reconcile poll requested with it follows
+            log.trace("Discarding playback state fetched before a local change.")
+            return
 
         changed = False
         if new_state is not None:  # We got a valid state (could be playing or not, but device is active)
-            if self.latest_playback_state is None or \
-                    new_state.get("timestamp") != self.latest_playback_state.get("timestamp") or \
-                    new_state.get("item", {}).get("id") != self.latest_playback_state.get("item", {}).get("id") or \
-                    new_state.get("is_playing") != self.latest_playback_state.get("is_playing") or \
-                    new_state.get("shuffle_state") != self.latest_playback_state.get("shuffle_state") or \
-                    new_state.get("repeat_state") != self.latest_playback_state.get("repeat_state") or \
-                    new_state.get("device", {}).get("id") != self.latest_playback_state.get("device", {}).get("id") or \
-                    new_state.get("device", {}).get("volume_percent") != self.latest_playback_state.get("device",
-                                                                                                        {}).get(
-                "volume_percent"):
+            fingerprint = _state_fingerprint(new_state)
+            if self.latest_playback_state is None or fingerprint != self._latest_fingerprint:
                 log.info("Spotify playback state changed.")
-                self.latest_playback_state = new_state
+                self._latest_fingerprint = fingerprint
                 changed = True
             else:
                 log.trace("No significant change in active playback state.")
+            # Always keep the fresh progress_ms for _next_poll_delay, even when nobody is notified
+            self.latest_playback_state = new_state
         elif self.latest_playback_state is not None:  # Previously had state, now new_state is None (e.g. player closed/inactive)
             log.info("Spotify playback became inactive or unavailable (was previously active).")
             self.latest_playback_state = None  # Update to reflect inactivity
@@ -524,35 +998,119 @@ class SpotifyController:
         # If both new_state and latest_playback_state are None, no change.
 
         if changed:
-            # Copy callbacks list in case it's modified during iteration by a callback
-            for callback in list(self.update_callbacks):
+            self._notify_state_changed()
+
+    def _notify_state_changed(self):
+        state = self.latest_playback_state
+        # One idle source per change, however many callbacks there are; UI updates happen on the main GTK thread
+        GLib.idle_add(self._dispatch_state_change, state)
+
+    def _dispatch_state_change(self, state: Optional[Dict[str, Any]]) -> bool:
+        # The field diff is taken here, on the main thread: notifications come from the poller and from
+        # worker threads, diffing there would race on _published_values
+        field_updates = self._collect_field_updates(state)
+        # Copy callbacks in case they are modified during iteration by a callback
+        calls = [(callback, state) for callback in list(self.update_callbacks)] + field_updates
+        for callback, argument in calls:
+            try:
+                callback(argument)
+            except Exception as e:  # One failing action must not keep the others from updating
                 name = getattr(callback, '__name__', repr(callback))
-                try:
-                    # Ensure UI updates happen on the main GTK thread
-                    GLib.idle_add(callback, self.latest_playback_state)  # Pass the new state (can be None)
-                except Exception as e:
-                    log.error(f"Error scheduling/executing callback {name} via GLib.idle_add: {e}")
+                log.error(f"Error executing update callback {name}: {e}")
+        return GLib.SOURCE_REMOVE
+
+    def _apply_local_change(self, device_fields: Optional[Dict[str, Any]] = None, **fields: Any):
+        """
+        Patches latest_playback_state with the outcome of a successful command and notifies the
+        callbacks right away, instead of waiting for the next poll. A reconcile poll confirms it.
+        """
+        self._local_change_seq += 1
+        state = self.latest_playback_state
+        if state is not None:
+            new_state = {**state, **fields}
+            if device_fields and isinstance(state.get("device"), dict):
+                new_state["device"] = {**state["device"], **device_fields}
+            self.latest_playback_state = new_state
+            self._latest_fingerprint = _state_fingerprint(new_state)
+            self._notify_state_changed()
+        self.request_reconcile_poll()
+
+    def request_reconcile_poll(self, delay: float = RECONCILE_POLL_DELAY_SECONDS):
+        """Moves the next poll forward to at most delay seconds from now."""
+        self._reconcile_poll_at = time.monotonic() + delay
+        self._poll_wakeup_event.set()
+
+    def _collect_field_updates(self, state: Optional[Dict[str, Any]]) -> List[Tuple[Callable[[Any], None], Any]]:
+        """(subscriber, value) calls for every field whose value differs from the last published one. Main thread only."""
+        field_updates = []
+        for field, callbacks in list(self._subscribers.items()):
+            value = state.get(field) if state else None
+            if field in self._published_values and self._published_values[field] == value:
+                continue
+            self._published_values[field] = value
+            field_updates.extend((callback, value) for callback in list(callbacks))
+        return field_updates
+
+    def _next_poll_delay(self) -> float:
+        """
+        Seconds until the next poll, derived from the latest state: shortly after the current
+        track ends (capped at MAX_PLAYING_POLL_INTERVAL_SECONDS) while playing, and
+        PAUSED_POLL_INTERVAL_SECONDS while paused or inactive. After failed requests the delay
+        grows linearly with the number of consecutive failures instead.
+        """
+        failures = self._consecutive_fetch_failures
+        if failures:
+            return min(self._update_interval + POLL_ERROR_BACKOFF_SECONDS * failures, POLL_ERROR_MAX_INTERVAL_SECONDS)
+
+        state = self.latest_playback_state
+        if not state or not state.get("is_playing"):
+            return max(self._update_interval, PAUSED_POLL_INTERVAL_SECONDS)
+
+        max_delay = max(self._update_interval, MAX_PLAYING_POLL_INTERVAL_SECONDS)
+        item = state.get("item")
+        progress_ms = state.get("progress_ms")
+        duration_ms = item.get("duration_ms") if isinstance(item, dict) else None
+        if not isinstance(progress_ms, int) or not isinstance(duration_ms, int):
+            return max_delay
+        remaining = (duration_ms - progress_ms) / 1000 + TRACK_END_POLL_BUFFER_SECONDS
+        return min(max(remaining, self._update_interval), max_delay)
 
     def _polling_loop(self):
-        log.info(f"Spotify polling loop started. Interval: {self._update_interval}s.")
+        log.info(f"Spotify polling loop started. Base interval: {self._update_interval}s.")
         while not self._stop_polling_event.is_set():
             start_time = time.monotonic()
             self._perform_update_and_notify()
             elapsed_time = time.monotonic() - start_time
 
-            wait_time = self._update_interval - elapsed_time
-            if wait_time > 0:
-                if self._stop_polling_event.wait(wait_time):  # True if event set during wait
-                    break
-                    # If processing took longer than interval, loop immediately (or with minimal delay)
+            if not self._wait_for_next_poll(self._next_poll_delay() - elapsed_time):
+                break
+            # If processing took longer than interval, loop immediately (or with minimal delay)
             # This ensures we don't drift too far if API calls are slow.
         log.info("Spotify polling loop stopped.")
 
+    def _wait_for_next_poll(self, wait_time: float) -> bool:
+        """Waits wait_time seconds, or less if a reconcile poll is requested. False once polling is stopped."""
+        deadline = time.monotonic() + wait_time
+        while True:
+            reconcile_at = self._reconcile_poll_at
+            if reconcile_at is not None:
+                deadline = min(deadline, reconcile_at)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._poll_wakeup_event.wait(remaining)
+            self._poll_wakeup_event.clear()
+            if self._stop_polling_event.is_set():
+                return False
+        self._reconcile_poll_at = None
+        return not self._stop_polling_event.is_set()
+
     def start_polling_updates(self):
         if self._polling_thread and self._polling_thread.is_alive():
             log.info("Polling thread is already running.")
             return
         self._stop_polling_event.clear()
+        self._poll_wakeup_event.clear()
         self._polling_thread = threading.Thread(target=self._polling_loop, daemon=True, name="SpotifyPollingThread")
         self._polling_thread.start()
 
@@ -562,6 +1120,7 @@ class SpotifyController:
             return
         log.info("Stopping Spotify polling updates...")
         self._stop_polling_event.set()
+        self._poll_wakeup_event.set()
         # Give the thread a bit more time than the interval to finish its current cycle + wait
         self._polling_thread.join(timeout=self._update_interval + 2.0)
         if self._polling_thread.is_alive():
@@ -575,7 +1134,7 @@ class SpotifyController:
             log.error(f"Attempted to register non-callable object as callback: {name}")
             return
         if callback not in self.update_callbacks:
-            self.update_callbacks.append(callback)
+            self.update_callbacks[callback] = None
             log.info(f"Callback {name} registered.")
             # Optionally, provide current state immediately to new callback via main thread
             if self.latest_playback_state is not None:  # Or even if it's None, to signal current status
@@ -583,12 +1142,35 @@ class SpotifyController:
         else:
             log.info(f"Callback {name} already registered.")
 
+    def subscribe(self, field: str, callback: Callable[[Any], None]):
+        """
+        Calls callback(value) on the main thread whenever the top-level playback state field changes
+        (None while nothing is playing). All subscribers share the single poll request.
+        """
+        name = getattr(callback, '__name__', repr(callback))
+        if callback in self._subscribers[field]:
+            log.info("Callback {} already subscribed to {}.", name, field)
+        else:
+            self._subscribers[field][callback] = None
+            log.info("Callback {} subscribed to {}.", name, field)
+        # Also for repeated subscriptions: a key shown again has to redraw from the current value
+        if self.latest_playback_state is not None:
+            GLib.idle_add(_invoke_on_main_thread, callback, self.latest_playback_state.get(field))
+
+    def unsubscribe(self, field: str, callback: Callable[[Any], None]):
+        name = getattr(callback, '__name__', repr(callback))
+        try:
+            del self._subscribers[field][callback]
+            log.info("Callback {} unsubscribed from {}.", name, field)
+        except KeyError:
+            log.warning("Callback {} not subscribed to {}.", name, field)
+
     def unregister_update_callback(self, callback: Callable[[Optional[Dict[str, Any]]], None]):
         name = getattr(callback, '__name__', repr(callback))
         try:
-            self.update_callbacks.remove(callback)
+            del self.update_callbacks[callback]
             log.info(f"Callback {name} unregistered.")
-        except ValueError:
+        except KeyError:
             log.warning(f"Callback {name} not found for unregistration.")
 
     def get_raw_playback_devices(self)-> Optional[Dict[str, Any]]:
@@ -597,7 +1179,7 @@ class SpotifyController:
             response = self._make_api_request("GET", DEVICES_ENDPOINT)
             if response:
                 if response.status_code == 200:  # State returned
-                    return response.json()
+                    return json_codec.loads(response.content)
                 # Other status codes are handled by raise_for_status in decorator
             return None  # If _make_api_request returned None (e.g. no token)
         except requests.RequestException as e:  # Catch errors from _make_api_request
@@ -617,26 +1199,7 @@ class SpotifyController:
         devices_list = []
         for device_dict in raw_devices_data["devices"]:
             try:
-                # Convert the 'type' string to DeviceType enum
-                # The Spotify API often uses TitleCase for device types,
-                # so ensure your from_string or direct enum conversion handles this (e.g., .lower())
-                device_type_str = device_dict.get("type", "unknown")  # Default to "unknown" if missing
-                #device_type_enum = DeviceType.from_string(device_type_str)
-
-                # Create the Device dataclass instance
-                # Using .get() for keys that might be missing to avoid KeyErrors
-                # or ensure your API contract guarantees their presence.
-                device_obj = Device(
-                    id=device_dict["id"],  # Assuming 'id' is always present
-                    is_active=device_dict.get("is_active", False),
-                    is_private_session=device_dict.get("is_private_session", False),
-                    is_restricted=device_dict.get("is_restricted", False),
-                    name=device_dict.get("name", "Unknown Device"),
-                    type=device_type_str,
-                    volume_percent=device_dict.get("volume_percent"),  # Handles if volume_percent is null
-                    supports_volume=device_dict.get("supports_volume", False)
-                )
-                devices_list.append(device_obj)
+                devices_list.append(Device.from_dict(device_dict))
             except KeyError as e:
                 log.error(f"Missing key {e} in device data: {device_dict}")
             except Exception as e:  # Catch any other unexpected error during conversion
@@ -648,6 +1211,7 @@ class SpotifyController:
         try:
             response = self._make_api_request("PUT", PLAYER_BASE_ENDPOINT,
                                               json={"device_ids": [device.id]})
+            self.invalidate_playback_state()
             # Spotify usually returns 204 No Content for successful control actions
             return response is not None and response.status_code == 204
         except requests.RequestException as e:
@@ -1,3 +1,5 @@
+from urllib.parse import urlparse, urlsplit, parse_qs
+
 from loguru import logger as log
 
 import gi
@@ -7,57 +9,114 @@ gi.require_version('WebKit', '6.0') # Or WebKit2GTK for older GTK3/WebKit versio
 from gi.repository import Gtk, Adw, WebKit, Gio, GLib
 
 
+REDIRECT_TARGET_PREFIX = "https://stream-controller/callback"  # Must match REDIRECT_URI in SpotifyController
+NAVIGATION_ACTION = WebKit.PolicyDecisionType.NAVIGATION_ACTION  # Resolved once, compared on every decision
+
+
 def is_redirect_target(url):
-    return url.startswith("https://stream-controller/callback") # Example
+    return url.startswith(REDIRECT_TARGET_PREFIX)
 
 
 def _on_load_changed(webview, load_event):
     if load_event == WebKit.LoadEvent.FINISHED:
-        current_uri = webview.get_uri()
-        log.info(f"Load finished: {current_uri}")
+        # Lazy: the URI is only fetched and formatted when debug logging is enabled
+        log.opt(lazy=True).debug("Load finished: {}", webview.get_uri)
 
 
 class WebAuthWindow(Adw.Window):
-    def __init__(self, initial_url, callback, **kwargs):
+    def __init__(self, initial_url, callback, error_callback=None, expected_state=None, **kwargs):
+        # Checked before any widget exists: only an https URL with a host can lead to the consent page
+        url_parts = urlsplit(initial_url)
+        if url_parts.scheme != "https" or not url_parts.hostname:
+            raise ValueError("WebAuthWindow needs an https login URL with a host")
         super().__init__(**kwargs)
         self.initial_url = initial_url
         self.redirected_url = None
         self.callback = callback
+        self.error_callback = error_callback  # Called with the OAuth error string if the login fails
+        self.expected_state = expected_state  # OAuth 'state' sent with the request, guards against CSRF
 
         self.set_title("Web Login")
         self.set_default_size(600, 400)
 
-        self.webview = WebKit.WebView()
+        # Cookies and cache of the login stay in memory and go away with the window, nothing is written to disk
+        self._network_session = WebKit.NetworkSession.new_ephemeral()
+        # Resolve the login host in the network process while the WebView is still being set up
+        self._network_session.prefetch_dns(url_parts.hostname)
+        self.webview = WebKit.WebView(network_session=self._network_session)
+        # The consent page needs JavaScript and nothing more; skip the heavier engine features
+        settings = self.webview.get_settings()
+        settings.set_enable_webgl(False)
+        settings.set_enable_media(False)
+        settings.set_enable_webaudio(False)
+        settings.set_enable_hyperlink_auditing(False)
+        settings.set_enable_smooth_scrolling(False)
+        settings.set_enable_developer_extras(False)
+        settings.set_media_playback_requires_user_gesture(True)
         self.set_content(self.webview)
 
         # Connect to the 'load-changed' signal to detect URL changes
-        self.webview.connect("load-changed", _on_load_changed)
         # Connect to 'decide-policy' for more control (optional but good for redirects)
-        self.webview.connect("decide-policy", self._on_decide_policy)
+        self._webview_handler_ids = [
+            self.webview.connect("load-changed", _on_load_changed),
+            self.webview.connect("decide-policy", self._on_decide_policy),
+        ]
+        self.connect("close-request", self._on_close_request)
 
         self.webview.load_uri(self.initial_url)
 
+    def _on_close_request(self, _window):
+        # Release the WebView right away so its web process can exit, instead of when the window is collected
+        webview = self.webview
+        if webview is not None:
+            for handler_id in self._webview_handler_ids:
+                webview.disconnect(handler_id)
+            self._webview_handler_ids = []
+            webview.stop_loading()
+            self.set_content(None)
+            self.webview = None
+        return False  # Let the window close
+
     def _on_decide_policy(self, webview, decision, decision_type):
-        if decision_type == WebKit.PolicyDecisionType.NAVIGATION_ACTION:
-            nav_action = decision.get_navigation_action()
-            uri = nav_action.get_request().get_uri()
-            log.info(f"Navigating to: {uri}")
-
-            # THIS IS WHERE YOU'LL LIKELY DETECT THE REDIRECT
-            # Add your specific logic to identify the target redirect URL
-            if is_redirect_target(uri):
-                self.redirected_url = uri
-                log.info(f"Redirect target reached: {self.redirected_url}")
-                self.close_and_extract()
-                decision.ignore() # Stop the navigation in the webview
-                return True
-        # Allow other decisions (e.g., new window, download)
+        if decision_type != NAVIGATION_ACTION:
+            # Allow other decisions (e.g., new window, download) without touching the decision object
+            return False # Let the default handler manage it
+
+        nav_action = decision.get_navigation_action()
+        uri = nav_action.get_request().get_uri()
+
+        # THIS IS WHERE YOU'LL LIKELY DETECT THE REDIRECT
+        # Add your specific logic to identify the target redirect URL
+        if is_redirect_target(uri):
+            self.redirected_url = uri
+            log.debug("Redirect target reached.")  # The URL carries the authorization code, keep it out of the log
+            # Stop the navigation before anything is requested, then tear the window (and WebView) down
+            decision.ignore()
+            self.close_and_extract()
+            return True
+        log.trace("Navigating to: {}", uri)  # Only after the redirect check, the callback URL carries the code
         return False # Let the default handler manage it
 
     def close_and_extract(self):
-        log.info(f"Closing window. Extracted URL: {self.redirected_url}")
-        code = self.redirected_url.split("https://stream-controller/callback?code=", 1)[1]
-        log.info(f"Closing window. Extracted Code: {code}")
+        # Spotify appends '&state=...' and answers denied logins with '?error=...', so parse the query properly
+        query = parse_qs(urlparse(self.redirected_url).query)
+        code = query.get("code", [None])[0]
+        error = query.get("error", [None])[0]
+        state = query.get("state", [None])[0]
         self.close()
-        if code and self.callback:
-            GLib.idle_add(self.callback, code)
+
+        if error is None and self.expected_state is not None and state != self.expected_state:
+            error = "state_mismatch"
+        elif error is None and not code:
+            error = "missing_code"
+
+        if error is not None:
+            log.error(f"Spotify login failed: {error}")
+            if self.error_callback:
+                self.error_callback(error)
+            return
+
+        log.info("Closing window. Extracted authorization code.")
+        if self.callback:
+            # Called in the same main-loop iteration; the callbacks only store the code and schedule work
+            self.callback(code)